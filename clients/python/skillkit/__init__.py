@@ -1,8 +1,12 @@
-from skillkit.client import SkillKitClient
+import asyncio
+import os
+
+from skillkit.client import SkillKitClient, close_shared
 from skillkit.models import Skill, SearchResponse, HealthResponse, CacheStats, Category
 
 __all__ = [
     "SkillKitClient",
+    "close_shared",
     "Skill",
     "SearchResponse",
     "HealthResponse",
@@ -10,3 +14,11 @@ __all__ = [
     "Category",
 ]
 __version__ = "0.1.0"
+
+if os.environ.get("SKILLKIT_USE_UVLOOP") == "1":
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
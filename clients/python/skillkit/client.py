@@ -1,11 +1,19 @@
 from __future__ import annotations
 
-from typing import Optional
-from urllib.parse import quote
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, TypeVar, Union
+from urllib.parse import quote, urlencode
 
 import httpx
+import msgspec
 
 from skillkit.models import (
+    BatchSearchResponse,
     CacheStats,
     CategoriesResponse,
     Category,
@@ -16,37 +24,223 @@ from skillkit.models import (
 )
 
 
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=50,
+    keepalive_expiry=30.0,
+)
+
+T = TypeVar("T")
+
+DISK_CACHE_TTL = 3600
+HEALTH_DISK_CACHE_TTL = 30
+
+_HEALTH_DEC = msgspec.json.Decoder(HealthResponse)
+_SEARCH_DEC = msgspec.json.Decoder(SearchResponse)
+_BATCH_DEC = msgspec.json.Decoder(BatchSearchResponse)
+_SKILL_DEC = msgspec.json.Decoder(Skill)
+_TRENDING_DEC = msgspec.json.Decoder(TrendingResponse)
+_CATEGORIES_DEC = msgspec.json.Decoder(CategoriesResponse)
+_CACHE_STATS_DEC = msgspec.json.Decoder(CacheStats)
+
+_SAFE_RE = re.compile(r"[A-Za-z0-9._~-]+")
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+_SHARED: dict[tuple[int, str, float], tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+@lru_cache(maxsize=4096)
+def _quote_slow(segment: str) -> str:
+    return quote(segment, safe="")
+
+
+def _quote(segment: str) -> str:
+    if _SAFE_RE.fullmatch(segment):
+        return segment
+    return _quote_slow(segment)
+
+
+@lru_cache(maxsize=1024)
+def _encode_search_qs(query: str, limit: int, include_content: bool) -> str:
+    params = {"q": query, "limit": limit}
+    if include_content:
+        params["include_content"] = "true"
+    return urlencode(params)
+
+
+def _check(response: httpx.Response) -> None:
+    if not 200 <= response.status_code < 300:
+        response.raise_for_status()
+
+
+def _no_cache(response: httpx.Response) -> bool:
+    directives = response.headers.get("cache-control", "").lower()
+    return "no-cache" in directives or "no-store" in directives
+
+
+async def close_shared() -> None:
+    loop = asyncio.get_running_loop()
+    for key, (owner, client) in list(_SHARED.items()):
+        if owner is loop:
+            del _SHARED[key]
+            await client.aclose()
+        elif owner.is_closed():
+            del _SHARED[key]
+
+
 class SkillKitClient:
-    def __init__(self, base_url: str = "http://localhost:3737", timeout: float = 30.0):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:3737",
+        timeout: float = 30.0,
+        http2: bool = True,
+        limits: Optional[httpx.Limits] = None,
+        shared: bool = False,
+        ttl_seconds: float = 0.0,
+        max_entries: int = 256,
+        cache_dir: Optional[Union[str, Path]] = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self._client: Optional[httpx.AsyncClient] = None
+        self.http2 = http2
+        self.limits = limits or DEFAULT_LIMITS
+        self.shared = shared
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._etags: OrderedDict[str, tuple[str, Skill]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._disk = None
+        if cache_dir is not None:
+            try:
+                import diskcache
+            except ImportError as e:
+                raise ImportError(
+                    "cache_dir requires diskcache: pip install 'skillkit-client[disk]'"
+                ) from e
+            self._disk = diskcache.Cache(str(Path(cache_dir).expanduser()))
+        self._client: Optional[httpx.AsyncClient] = None if shared else self._build_client()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            http2=self.http2,
+            limits=self.limits,
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is not None:
+            return self._client
+        loop = asyncio.get_running_loop()
+        key = (id(loop), self.base_url, self.timeout)
+        entry = _SHARED.get(key)
+        if entry is None or entry[0] is not loop or entry[1].is_closed:
+            for stale in [k for k, (owner, _) in _SHARED.items() if owner.is_closed()]:
+                del _SHARED[stale]
+            entry = _SHARED[key] = (loop, self._build_client())
+        return entry[1]
 
     async def __aenter__(self) -> "SkillKitClient":
-        self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
         return self
 
     async def __aexit__(self, *args: object) -> None:
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        await self.close()
 
-    def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None:
-            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
-        return self._client
+    async def _get(
+        self,
+        path: str,
+        params: Optional[dict[str, str]] = None,
+        cacheable: bool = True,
+        stream: bool = False,
+        disk_ttl: float = 0,
+    ) -> Union[bytes, bytearray]:
+        remember = cacheable and self.ttl_seconds > 0
+        disk_ttl = disk_ttl if self._disk is not None else 0
+        key = None
+        if remember or disk_ttl:
+            key = f"GET:{path}?{sorted(params.items()) if params else ''}"
+        if remember:
+            entry = self._cache.get(key)
+            if entry is not None:
+                expires, content = entry
+                if expires > time.monotonic():
+                    self._cache.move_to_end(key)
+                    return content
+                del self._cache[key]
+        if disk_ttl:
+            content = await asyncio.to_thread(self._disk.get, (self.base_url, key))
+            if content is not None:
+                if remember:
+                    self._remember(key, content)
+                return content
+        content: Union[bytes, bytearray]
+        if stream:
+            async with self._get_client().stream("GET", path, params=params) as response:
+                if not 200 <= response.status_code < 300:
+                    await response.aread()
+                    response.raise_for_status()
+                content = bytearray()
+                async for chunk in response.aiter_bytes():
+                    content.extend(chunk)
+        else:
+            response = await self._get_client().get(path, params=params)
+            _check(response)
+            content = response.content
+        if key is not None and not _no_cache(response):
+            if remember:
+                self._remember(key, bytes(content))
+            if disk_ttl:
+                await asyncio.to_thread(
+                    self._disk.set, (self.base_url, key), bytes(content), expire=disk_ttl
+                )
+        return content
 
-    async def health(self) -> HealthResponse:
+    async def _singleflight(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+
+            def _done(t: asyncio.Future) -> None:
+                if self._inflight.get(key) is t:
+                    del self._inflight[key]
+                if not t.cancelled():
+                    t.exception()
+
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    def _remember(self, key: str, content: bytes) -> None:
+        self._cache[key] = (time.monotonic() + self.ttl_seconds, content)
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, pattern: Optional[str] = None) -> None:
+        if pattern is None:
+            self._cache.clear()
+            self._etags.clear()
+        else:
+            for key in [k for k in self._cache if pattern in k]:
+                del self._cache[key]
+            for path in [p for p in self._etags if pattern in p]:
+                del self._etags[path]
+        if self._disk is not None:
+            for disk_key in list(self._disk.iterkeys()):
+                if not isinstance(disk_key, tuple) or len(disk_key) != 2:
+                    continue
+                base_url, key = disk_key
+                if base_url == self.base_url and (pattern is None or pattern in key):
+                    self._disk.delete(disk_key)
+
+    async def _post_json(self, path: str, obj: object) -> httpx.Response:
         client = self._get_client()
-        response = await client.get("/health")
-        response.raise_for_status()
-        data = response.json()
-        return HealthResponse(
-            status=data["status"],
-            version=data["version"],
-            skill_count=data.get("skillCount", 0),
-            uptime=data.get("uptime", 0),
-        )
+        return await client.post(path, content=msgspec.json.encode(obj), headers=_JSON_HEADERS)
+
+    async def health(self) -> HealthResponse:
+        content = await self._get("/health", disk_ttl=HEALTH_DISK_CACHE_TTL)
+        return _HEALTH_DEC.decode(content)
 
     async def search(
         self,
@@ -54,19 +248,39 @@ class SkillKitClient:
         limit: int = 20,
         include_content: bool = False,
     ) -> SearchResponse:
-        client = self._get_client()
-        params = {"q": query, "limit": str(limit)}
-        if include_content:
-            params["include_content"] = "true"
-        response = await client.get("/search", params=params)
-        response.raise_for_status()
-        data = response.json()
-        return SearchResponse(
-            skills=[Skill(**s) for s in data["skills"]],
-            total=data["total"],
-            query=data["query"],
-            limit=data["limit"],
-        )
+        path = f"/search?{_encode_search_qs(query, limit, include_content)}"
+
+        async def _fetch() -> SearchResponse:
+            content = await self._get(path, stream=include_content)
+            return _SEARCH_DEC.decode(content)
+
+        result = await self._singleflight(path, _fetch)
+        return msgspec.structs.replace(result, skills=list(result.skills))
+
+    async def search_batch(
+        self,
+        queries: list[str],
+        limit: int = 20,
+        include_content: bool = False,
+    ) -> list[SearchResponse]:
+        body = {
+            "batch": [
+                {"query": q, "limit": limit, "include_content": include_content}
+                for q in queries
+            ]
+        }
+        response = await self._post_json("/search/batch", body)
+        try:
+            _check(response)
+        except httpx.HTTPStatusError:
+            if response.status_code != 404:
+                raise
+            return list(
+                await asyncio.gather(
+                    *[self.search(q, limit=limit, include_content=include_content) for q in queries]
+                )
+            )
+        return _BATCH_DEC.decode(response.content).results
 
     async def search_with_filters(
         self,
@@ -77,7 +291,6 @@ class SkillKitClient:
         category: Optional[str] = None,
         source: Optional[str] = None,
     ) -> SearchResponse:
-        client = self._get_client()
         body: dict = {"query": query, "limit": limit, "include_content": include_content}
         filters: dict = {}
         if tags:
@@ -88,53 +301,70 @@ class SkillKitClient:
             filters["source"] = source
         if filters:
             body["filters"] = filters
-        response = await client.post("/search", json=body)
-        response.raise_for_status()
-        data = response.json()
-        return SearchResponse(
-            skills=[Skill(**s) for s in data["skills"]],
-            total=data["total"],
-            query=data["query"],
-            limit=data["limit"],
-        )
+        response = await self._post_json("/search", body)
+        _check(response)
+        return _SEARCH_DEC.decode(response.content)
 
     async def get_skill(self, source: str, skill_id: str) -> Skill:
-        client = self._get_client()
-        parts = source.split("/", 1)
-        owner = quote(parts[0], safe="")
-        repo = quote(parts[1], safe="") if len(parts) > 1 else owner
-        response = await client.get(f"/skills/{owner}/{repo}/{quote(skill_id, safe='')}")
-        response.raise_for_status()
-        return Skill(**response.json())
+        owner, sep, repo = source.partition("/")
+        owner = _quote(owner)
+        repo = _quote(repo) if sep else owner
+        path = f"/skills/{owner}/{repo}/{_quote(skill_id)}"
+        return await self._singleflight(path, lambda: self._fetch_skill(path))
+
+    async def _fetch_skill(self, path: str) -> Skill:
+        cached = self._etags.get(path)
+        headers = {"if-none-match": cached[0]} if cached else None
+        response = await self._get_client().get(path, headers=headers)
+        if response.status_code == 304 and cached:
+            if path in self._etags:
+                self._etags.move_to_end(path)
+            return cached[1]
+        _check(response)
+        skill = _SKILL_DEC.decode(response.content)
+        etag = response.headers.get("etag")
+        if etag:
+            self._etags[path] = (etag, skill)
+            self._etags.move_to_end(path)
+            if len(self._etags) > self.max_entries:
+                self._etags.popitem(last=False)
+        return skill
+
+    async def get_skills(
+        self,
+        refs: list[tuple[str, str]],
+        concurrency: int = 16,
+    ) -> list[Skill]:
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(source: str, skill_id: str) -> Skill:
+            async with sem:
+                return await self.get_skill(source, skill_id)
+
+        return list(await asyncio.gather(*[_one(s, i) for s, i in refs]))
 
     async def trending(self, limit: int = 20) -> list[Skill]:
-        client = self._get_client()
-        response = await client.get("/trending", params={"limit": str(limit)})
-        response.raise_for_status()
-        data = response.json()
-        return [Skill(**s) for s in data["skills"]]
+        params = {"limit": str(limit)}
+
+        async def _fetch() -> TrendingResponse:
+            content = await self._get("/trending", params, disk_ttl=DISK_CACHE_TTL)
+            return _TRENDING_DEC.decode(content)
+
+        result = await self._singleflight(f"/trending?limit={limit}", _fetch)
+        return list(result.skills)
 
     async def categories(self) -> list[Category]:
-        client = self._get_client()
-        response = await client.get("/categories")
-        response.raise_for_status()
-        data = response.json()
-        return [Category(**c) for c in data["categories"]]
+        content = await self._get("/categories", disk_ttl=DISK_CACHE_TTL)
+        return _CATEGORIES_DEC.decode(content).categories
 
     async def cache_stats(self) -> CacheStats:
-        client = self._get_client()
-        response = await client.get("/cache/stats")
-        response.raise_for_status()
-        data = response.json()
-        return CacheStats(
-            hits=data["hits"],
-            misses=data["misses"],
-            size=data["size"],
-            max_size=data.get("maxSize", 0),
-            hit_rate=data.get("hitRate", 0.0),
-        )
+        content = await self._get("/cache/stats", cacheable=False)
+        return _CACHE_STATS_DEC.decode(content)
 
     async def close(self) -> None:
-        if self._client:
+        if self._client is not None:
             await self._client.aclose()
-            self._client = None
+        if self._disk is not None:
+            self._disk.close()
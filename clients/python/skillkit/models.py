@@ -1,8 +1,9 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import Any, Optional
 
+import msgspec
 
-class Skill(BaseModel):
+
+class Skill(msgspec.Struct, frozen=True, kw_only=True, gc=False):
     name: str
     description: Optional[str] = None
     source: str
@@ -14,21 +15,40 @@ class Skill(BaseModel):
     installs: Optional[int] = None
 
 
-class SearchResponse(BaseModel):
+class SearchResponse(msgspec.Struct, frozen=True):
     skills: list[Skill]
     total: int
     query: str
     limit: int
 
+    def columns(self) -> dict[str, Any]:
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError(
+                "SearchResponse.columns() requires numpy: pip install 'skillkit-client[numpy]'"
+            ) from e
+        n = len(self.skills)
+        return {
+            "name": [s.name for s in self.skills],
+            "source": [s.source for s in self.skills],
+            "stars": np.fromiter((s.stars or 0 for s in self.skills), dtype=np.int64, count=n),
+            "installs": np.fromiter((s.installs or 0 for s in self.skills), dtype=np.int64, count=n),
+        }
+
+
+class BatchSearchResponse(msgspec.Struct, frozen=True):
+    results: list[SearchResponse]
+
 
-class HealthResponse(BaseModel):
+class HealthResponse(msgspec.Struct, frozen=True, rename="camel"):
     status: str
     version: str
     skill_count: int = 0
     uptime: int = 0
 
 
-class CacheStats(BaseModel):
+class CacheStats(msgspec.Struct, frozen=True, rename="camel"):
     hits: int
     misses: int
     size: int
@@ -36,16 +56,16 @@ class CacheStats(BaseModel):
     hit_rate: float = 0.0
 
 
-class Category(BaseModel):
+class Category(msgspec.Struct, frozen=True, gc=False):
     name: str
     count: int
 
 
-class CategoriesResponse(BaseModel):
+class CategoriesResponse(msgspec.Struct, frozen=True):
     categories: list[Category]
     total: int
 
 
-class TrendingResponse(BaseModel):
+class TrendingResponse(msgspec.Struct, frozen=True):
     skills: list[Skill]
     limit: int
@@ -1,8 +1,13 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
 import pytest
 import httpx
 import respx
 
-from skillkit import SkillKitClient
+from skillkit import SkillKitClient, close_shared
 
 
 BASE_URL = "http://localhost:3737"
@@ -24,6 +29,7 @@ async def test_health(mock_api):
         assert health.status == "ok"
         assert health.version == "1.11.0"
         assert health.skill_count == 100
+        assert health.uptime == 60
 
 
 @pytest.mark.asyncio
@@ -97,3 +103,319 @@ async def test_cache_stats(mock_api):
         stats = await client.cache_stats()
         assert stats.hits == 10
         assert stats.size == 8
+        assert stats.max_size == 500
+        assert stats.hit_rate == 0.667
+
+
+@pytest.fixture
+def client_kwargs(monkeypatch):
+    captured: dict = {}
+
+    class SpyClient(httpx.AsyncClient):
+        def __init__(self, *args, **kwargs):
+            captured.update(kwargs)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", SpyClient)
+    return captured
+
+
+@pytest.mark.asyncio
+async def test_http2_enabled_by_default(client_kwargs):
+    async with SkillKitClient(BASE_URL):
+        assert client_kwargs["http2"] is True
+
+
+@pytest.mark.asyncio
+async def test_http1_with_custom_limits(mock_api, client_kwargs):
+    mock_api.get("/health").respond(json={"status": "ok", "version": "1.11.0"})
+    limits = httpx.Limits(max_connections=4, max_keepalive_connections=2)
+    async with SkillKitClient(BASE_URL, http2=False, limits=limits) as client:
+        assert client_kwargs["http2"] is False
+        assert client_kwargs["limits"] is limits
+        health = await client.health()
+        assert health.status == "ok"
+
+
+@pytest.mark.asyncio
+async def test_shared_client(mock_api):
+    mock_api.get("/health").respond(json={"status": "ok", "version": "1.11.0"})
+    a = SkillKitClient(BASE_URL, shared=True)
+    b = SkillKitClient(BASE_URL, shared=True)
+    try:
+        assert a._get_client() is b._get_client()
+        await a.close()
+        health = await b.health()
+        assert health.status == "ok"
+    finally:
+        await close_shared()
+
+
+def test_shared_client_across_event_loops(http_server):
+    url, seen = http_server
+
+    async def check() -> None:
+        client = SkillKitClient(url, shared=True)
+        health = await client.health()
+        assert health.status == "ok"
+
+    asyncio.run(check())
+    asyncio.run(check())
+    assert len(seen) == 2
+    asyncio.run(close_shared())
+
+
+@pytest.mark.asyncio
+async def test_get_skills(mock_api):
+    mock_api.get("/skills/owner/repo/a").respond(json={"name": "a", "source": "owner/repo"})
+    mock_api.get("/skills/owner/repo/b").respond(json={"name": "b", "source": "owner/repo"})
+    async with SkillKitClient(BASE_URL) as client:
+        skills = await client.get_skills(
+            [("owner/repo", "a"), ("owner/repo", "b")], concurrency=1
+        )
+        assert [s.name for s in skills] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_search_batch(mock_api):
+    mock_api.post("/search/batch").respond(
+        json={
+            "results": [
+                {"skills": [{"name": "react-perf", "source": "owner/repo"}], "total": 1, "query": "react", "limit": 20},
+                {"skills": [], "total": 0, "query": "vue", "limit": 20},
+            ]
+        }
+    )
+    async with SkillKitClient(BASE_URL) as client:
+        results = await client.search_batch(["react", "vue"])
+        assert [r.query for r in results] == ["react", "vue"]
+        assert results[0].skills[0].name == "react-perf"
+
+
+@pytest.mark.asyncio
+async def test_search_batch_fallback(mock_api):
+    mock_api.post("/search/batch").respond(404)
+    route = mock_api.get("/search").respond(
+        json={"skills": [], "total": 0, "query": "react", "limit": 20}
+    )
+    async with SkillKitClient(BASE_URL) as client:
+        results = await client.search_batch(["react", "vue"])
+        assert len(results) == 2
+        assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_search_with_filters_body(mock_api):
+    route = mock_api.post("/search").respond(
+        json={"skills": [], "total": 0, "query": "auth", "limit": 5}
+    )
+    async with SkillKitClient(BASE_URL) as client:
+        await client.search_with_filters("auth", limit=5, tags=["nextjs"], source="other")
+    request = route.calls.last.request
+    assert request.headers["content-type"] == "application/json"
+    assert json.loads(request.content) == {
+        "query": "auth",
+        "limit": 5,
+        "include_content": False,
+        "filters": {"tags": ["nextjs"], "source": "other"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_skill_quotes_path(mock_api):
+    route = mock_api.get("/skills/my%20org/repo/a%2Fb").respond(
+        json={"name": "a/b", "source": "my org/repo"}
+    )
+    async with SkillKitClient(BASE_URL) as client:
+        skill = await client.get_skill("my org/repo", "a/b")
+        assert skill.name == "a/b"
+    assert route.called
+
+
+@pytest.mark.asyncio
+async def test_response_cache(mock_api):
+    route = mock_api.get("/categories").respond(
+        json={"categories": [{"name": "react", "count": 5}], "total": 1}
+    )
+    async with SkillKitClient(BASE_URL, ttl_seconds=60) as client:
+        await client.categories()
+        cats = await client.categories()
+        assert cats[0].name == "react"
+        assert route.call_count == 1
+        client.invalidate("/categories")
+        await client.categories()
+        assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_response_cache_honors_no_cache(mock_api):
+    route = mock_api.get("/trending").respond(
+        json={"skills": [], "limit": 20}, headers={"cache-control": "no-cache"}
+    )
+    async with SkillKitClient(BASE_URL, ttl_seconds=60) as client:
+        await client.trending()
+        await client.trending()
+        assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_search_include_content(mock_api):
+    route = mock_api.get("/search").respond(
+        json={
+            "skills": [{"name": "react-perf", "source": "owner/repo", "content": "# React\n" * 500}],
+            "total": 1,
+            "query": "react",
+            "limit": 20,
+        }
+    )
+    async with SkillKitClient(BASE_URL) as client:
+        result = await client.search("react", include_content=True)
+        assert result.skills[0].content.startswith("# React")
+    assert route.calls.last.request.url.params["include_content"] == "true"
+
+
+@pytest.mark.asyncio
+async def test_disk_cache(mock_api, tmp_path):
+    pytest.importorskip("diskcache")
+    route = mock_api.get("/categories").respond(
+        json={"categories": [{"name": "react", "count": 5}], "total": 1}
+    )
+    async with SkillKitClient(BASE_URL, cache_dir=tmp_path) as client:
+        await client.categories()
+    async with SkillKitClient(BASE_URL, cache_dir=tmp_path) as client:
+        cats = await client.categories()
+        assert cats[0].name == "react"
+        assert route.call_count == 1
+        client._disk.set("unrelated", b"value")
+        client.invalidate("/categories")
+        await client.categories()
+        assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_skill_etag_revalidation(mock_api):
+    route = mock_api.get("/skills/owner/repo/react-perf")
+    route.side_effect = [
+        httpx.Response(200, json={"name": "react-perf", "source": "owner/repo"}, headers={"etag": '"v1"'}),
+        httpx.Response(304),
+    ]
+    async with SkillKitClient(BASE_URL) as client:
+        first = await client.get_skill("owner/repo", "react-perf")
+        second = await client.get_skill("owner/repo", "react-perf")
+        assert second is first
+    assert route.calls.last.request.headers["if-none-match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_search_encodes_query(mock_api):
+    route = mock_api.get("/search").respond(
+        json={"skills": [], "total": 0, "query": "react & vue", "limit": 5}
+    )
+    async with SkillKitClient(BASE_URL) as client:
+        await client.search("react & vue", limit=5)
+    params = route.calls.last.request.url.params
+    assert params["q"] == "react & vue"
+    assert params["limit"] == "5"
+    assert "include_content" not in params
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_coalesce(mock_api):
+    route = mock_api.get("/skills/owner/repo/react-perf").respond(
+        json={"name": "react-perf", "source": "owner/repo"}
+    )
+    async with SkillKitClient(BASE_URL) as client:
+        skills = await client.get_skills([("owner/repo", "react-perf")] * 5)
+        assert all(s is skills[0] for s in skills)
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_error_status_raises(mock_api):
+    mock_api.get("/categories").respond(500)
+    async with SkillKitClient(BASE_URL) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.categories()
+
+
+@pytest.fixture
+def http_server():
+    seen: list[str] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            seen.append(self.path)
+            body = b'{"status": "ok", "version": "1.11.0"}'
+            self.send_response(200)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", seen
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_client_honors_env_proxies(monkeypatch, http_server):
+    proxy_url, seen = http_server
+    for var in ("ALL_PROXY", "all_proxy", "NO_PROXY", "no_proxy", "http_proxy"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setenv("HTTP_PROXY", proxy_url)
+    async with SkillKitClient("http://skillkit.invalid") as client:
+        health = await client.health()
+    assert health.status == "ok"
+    assert seen == ["http://skillkit.invalid/health"]
+
+
+@pytest.mark.asyncio
+async def test_get_skills_rejects_invalid_concurrency():
+    async with SkillKitClient(BASE_URL) as client:
+        with pytest.raises(ValueError):
+            await client.get_skills([("owner/repo", "a")], concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_search_include_content_error_body_readable(mock_api):
+    mock_api.get("/search").respond(500, json={"error": "boom"})
+    async with SkillKitClient(BASE_URL) as client:
+        with pytest.raises(httpx.HTTPStatusError) as exc_info:
+            await client.search("react", include_content=True)
+    assert "boom" in exc_info.value.response.text
+
+
+@pytest.mark.asyncio
+async def test_get_skill_etag_cache_is_bounded(mock_api):
+    for name in ("a", "b", "c"):
+        mock_api.get(f"/skills/owner/repo/{name}").respond(
+            json={"name": name, "source": "owner/repo"}, headers={"etag": f'"{name}"'}
+        )
+    async with SkillKitClient(BASE_URL, max_entries=2) as client:
+        await client.get_skills([("owner/repo", n) for n in ("a", "b", "c")], concurrency=1)
+        assert list(client._etags) == ["/skills/owner/repo/b", "/skills/owner/repo/c"]
+
+
+@pytest.mark.asyncio
+async def test_coalesced_results_are_independent(mock_api):
+    mock_api.get("/trending").respond(
+        json={"skills": [{"name": "a", "source": "x/y"}, {"name": "b", "source": "x/y"}], "limit": 20}
+    )
+    mock_api.get("/search").respond(
+        json={"skills": [{"name": "a", "source": "x/y"}], "total": 1, "query": "a", "limit": 20}
+    )
+    async with SkillKitClient(BASE_URL) as client:
+        a, b = await asyncio.gather(client.trending(), client.trending())
+        a.pop()
+        assert len(b) == 2
+        r1, r2 = await asyncio.gather(client.search("a"), client.search("a"))
+        r1.skills.clear()
+        assert len(r2.skills) == 1
@@ -0,0 +1,38 @@
+import gc
+
+import msgspec
+import pytest
+
+from skillkit import SearchResponse, Skill
+
+
+def test_skill_is_frozen():
+    skill = Skill(name="react-perf", source="owner/repo")
+    assert not hasattr(skill, "__dict__")
+    with pytest.raises(AttributeError):
+        skill.name = "other"
+
+
+def test_search_response_columns():
+    np = pytest.importorskip("numpy")
+    response = SearchResponse(
+        skills=[
+            Skill(name="a", source="x/y", stars=10, installs=3),
+            Skill(name="b", source="x/z"),
+        ],
+        total=2,
+        query="q",
+        limit=20,
+    )
+    cols = response.columns()
+    assert cols["name"] == ["a", "b"]
+    assert cols["stars"].dtype == np.int64
+    assert cols["stars"].sum() == 10
+    assert cols["installs"].tolist() == [3, 0]
+
+
+def test_skill_rows_are_untracked_by_gc():
+    skills = msgspec.json.decode(
+        b'[{"name": "a", "source": "x/y", "tags": ["react"]}]', type=list[Skill]
+    )
+    assert not gc.is_tracked(skills[0])
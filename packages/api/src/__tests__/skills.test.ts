@@ -16,6 +16,16 @@ describe('Skill Routes', () => {
     expect(body.source).toBe('owner/repo');
   });
 
+  it('GET /skills/:owner/:repo/:id revalidates with If-None-Match', async () => {
+    const first = await app.request('/skills/owner/repo/my-skill');
+    const tag = first.headers.get('etag');
+    expect(tag).toBeTruthy();
+    const res = await app.request('/skills/owner/repo/my-skill', {
+      headers: { 'If-None-Match': tag! },
+    });
+    expect(res.status).toBe(304);
+  });
+
   it('GET /skills/:owner/:repo/:id returns 404 for missing skill', async () => {
     const res = await app.request('/skills/owner/repo/nonexistent');
     expect(res.status).toBe(404);
@@ -1,9 +1,12 @@
 import { Hono } from 'hono';
+import { etag } from 'hono/etag';
 import type { ApiSkill } from '../types.js';
 
 export function skillRoutes(skills: ApiSkill[]) {
   const app = new Hono();
 
+  app.use('/skills/*', etag());
+
   app.get('/skills/:owner/:repo/:id', (c) => {
     const source = `${c.req.param('owner')}/${c.req.param('repo')}`;
     const id = c.req.param('id');